@@ -9,7 +9,8 @@ by scripts.
 
 Main features
 -------------
-- Detect whether a name is already in use (`name_in_use`)
+- Detect whether a name is already in use (`name_in_use`, or the cached
+  `name_in_use_cached` for repeated queries)
 - Generate the next available unique name using a configurable suffix pattern
   (`next_unique_name`)
 - Rename objects so that all names within the working set are unique
@@ -30,8 +31,23 @@ This module is intended to be called from interactive tooling such as
 `toolbox.py`, but each function can also be used independently.
 """
 
+import operator
+import re
+import sys
+from collections import Counter
+
 import rhinoscriptsyntax as rs
-from utils import get_model_space_objects
+import scriptcontext as sc
+from utils import doc_cache_key, get_model_space_objects, get_selected_objects
+
+# Matches the numeric field of a suffix format, e.g. "{num}" or "{num:03d}"
+_NUM_FIELD = re.compile(r"\{num(?::([^{}]*))?\}")
+
+# Integer format specs with a direct %-format equivalent, e.g. "03d" -> "%03d"
+_PRINTF_SPEC = re.compile(r"^(0?)([1-9][0-9]*)?d?$")
+
+# Used-name set for name_in_use_cached, keyed by utils.doc_cache_key
+_used_name_cache = {}
 
 
 def name_in_use(name):
@@ -41,20 +57,52 @@ def name_in_use(name):
     Note
     ----
     This helper uses rs.ObjectsByName and is kept for compatibility and
-    external callers. The main renaming function uses a cached name set
-    for performance and does not call this in its inner loop.
+    external callers. Neither `next_unique_name` nor the main renaming
+    function call it; both check availability against a cached name set.
     """
     objs = rs.ObjectsByName(name)
     return bool(objs)
 
 
-def next_unique_name(base, suffix_fmt, start_at=2):
+def name_in_use_cached(name, doc_version):
+    """
+    Return True if any object in the document already uses 'name', answering
+    from a cached set of used names.
+
+    The set is built once per `utils.doc_cache_key(doc_version)`, so repeated
+    queries cost a set lookup instead of a document scan. Only the most recent
+    key is kept.
+
+    Parameters
+    ----------
+    name : str
+        Name to look up.
+    doc_version : hashable
+        Document state token (see `utils.doc_cache_key`). The caller must
+        pass a new value whenever names may have changed; reusing a token
+        returns the cached answer.
+
+    Note
+    ----
+    Callers performing bulk renames should keep their own `used_names` set
+    and pass it to `next_unique_name` instead.
+    """
+    key = doc_cache_key(doc_version)
+    used = _used_name_cache.get(key)
+    if used is None:
+        _used_name_cache.clear()
+        used = _used_name_cache[key] = _build_used_name_set()
+    return name in used
+
+
+def next_unique_name(base, suffix_fmt, used_names=None, start_at=2):
     """
     Return a unique object name by appending an incrementing numeric suffix.
 
-    This version uses the live document via name_in_use and is kept for
-    compatibility. The optimized renaming routine uses an internal cached
-    name set instead.
+    Thin public wrapper around `_next_unique_with_cache`: availability is
+    checked against a set of names known to be in use rather than by querying
+    the document for every candidate. When 'used_names' is not supplied, it
+    is built once from the document.
 
     Parameters
     ----------
@@ -62,20 +110,23 @@ def next_unique_name(base, suffix_fmt, start_at=2):
         Base name to modify.
     suffix_fmt : str
         A Python format string, e.g. " {num:03d}".
+    used_names : set of str, optional
+        Names already in use. The returned name is reserved in this set.
+        If None, the set is built with `_build_used_name_set`.
     start_at : int
         Initial numeric suffix to try.
     """
     base = base or "Object"
 
-    if not name_in_use(base):
+    if used_names is None:
+        used_names = _build_used_name_set()
+
+    if base not in used_names:
+        used_names.add(base)
         return base
 
-    n = start_at
-    while True:
-        candidate = "{}{}".format(base, suffix_fmt.format(num=n))
-        if not name_in_use(candidate):
-            return candidate
-        n += 1
+    return _next_unique_with_cache(base, _suffix_formatter(suffix_fmt),
+                                   used_names, {base: start_at})
 
 
 def _build_used_name_set():
@@ -87,19 +138,157 @@ def _build_used_name_set():
     used_names : set of str
         All non-empty names in the document.
     """
-    used = set()
-    all_ids = rs.AllObjects(select=False, include_lights=False, include_grips=False)
-    if not all_ids:
-        return used
+    return {obj.Attributes.Name for obj in sc.doc.Objects
+            if obj.Attributes.Name}
+
+
+def _split_suffix_fmt(suffix_fmt):
+    """
+    Split 'suffix_fmt' into its literal text and numeric field.
 
-    for oid in all_ids:
-        nm = rs.ObjectName(oid)
-        if nm:
-            used.add(nm)
-    return used
+    Returns
+    -------
+    parts : tuple of (str, str, str) or None
+        (text before the field, field format spec, text after the field),
+        with "{{" / "}}" escapes resolved, or None if the format string is
+        not a single "{num...}" field with literal text around it.
+    """
+    m = _NUM_FIELD.search(suffix_fmt)
+    if not m:
+        return None
+
+    head = suffix_fmt[:m.start()]
+    tail = suffix_fmt[m.end():]
+    for part in (head, tail):
+        if "{" in part.replace("{{", "") or "}" in part.replace("}}", ""):
+            return None
 
+    head = head.replace("{{", "{").replace("}}", "}")
+    tail = tail.replace("{{", "{").replace("}}", "}")
+    return head, m.group(1) or "", tail
 
-def _next_unique_with_cache(base, suffix_fmt, used_names, next_suffix_dict):
+
+def _to_printf(suffix_fmt):
+    """
+    Translate 'suffix_fmt' into an equivalent %-format string.
+
+    Examples: " {num:03d}" -> " %03d", ".{num}" -> ".%d".
+
+    Returns
+    -------
+    printf_fmt : str or None
+        The %-format string, or None if the format uses a spec with no
+        direct %-format equivalent.
+    """
+    parts = _split_suffix_fmt(suffix_fmt)
+    if parts is None:
+        return None
+
+    head, spec, tail = parts
+    m = _PRINTF_SPEC.match(spec)
+    if not m:
+        return None
+
+    field = "%" + m.group(1) + (m.group(2) or "") + "d"
+    return head.replace("%", "%%") + field + tail.replace("%", "%%")
+
+
+def _count_used_names():
+    """
+    Count how many objects in the document use each name.
+
+    Returns
+    -------
+    name_counts : Counter
+        Mapping of every non-empty name in the document to its number of
+        objects.
+    """
+    return Counter(obj.Attributes.Name for obj in sc.doc.Objects
+                   if obj.Attributes.Name)
+
+
+def _suffix_formatter(suffix_fmt):
+    """
+    Return a callable mapping a suffix number to its suffix string.
+
+    Simple integer formats are translated to %-formatting (see `_to_printf`)
+    so no format spec is parsed per call; any other format falls back to
+    str.format.
+
+    Parameters
+    ----------
+    suffix_fmt : str
+        Format string like " {num:03d}".
+    """
+    printf_fmt = _to_printf(suffix_fmt)
+    if printf_fmt is not None:
+        return printf_fmt.__mod__
+
+    fmt = suffix_fmt.format
+    return lambda n: fmt(num=n)
+
+
+def _suffix_pattern(suffix_fmt):
+    """
+    Compile a regex that splits names produced by 'suffix_fmt' into
+    (base, number).
+
+    Returns
+    -------
+    pattern : compiled regex or None
+        Pattern whose groups are the base name and the suffix digits, or None
+        if the format string is not understood (see `_split_suffix_fmt`).
+    """
+    parts = _split_suffix_fmt(suffix_fmt)
+    if parts is None:
+        return None
+
+    head, _, tail = parts
+    return re.compile("^(.*)" + re.escape(head) + r"(\d+)" + re.escape(tail) + "$")
+
+
+def _seed_next_suffix(used_names, bases, suffix_fmt):
+    """
+    Compute the first free suffix number for each base in a single pass.
+
+    For every name in 'used_names' that looks like base + suffix, the suffix
+    number is recorded, so allocation for a base starts above the highest
+    suffix already in use instead of probing upwards from 1.
+
+    Parameters
+    ----------
+    used_names : set of str
+        All names currently in use.
+    bases : container of str
+        Base names that will need suffixes.
+    suffix_fmt : str
+        Format string like " {num:03d}".
+
+    Returns
+    -------
+    next_suffix : dict
+        Mapping base -> next suffix number to try. Bases without any
+        suffixed names are omitted (allocation then starts at 1).
+    """
+    next_suffix = {}
+    pattern = _suffix_pattern(suffix_fmt)
+    if pattern is None:
+        return next_suffix
+
+    match = pattern.match
+    for nm in used_names:
+        m = match(nm)
+        if m is None:
+            continue
+        base = m.group(1)
+        if base in bases:
+            n = int(m.group(2)) + 1
+            if n > next_suffix.get(base, 1):
+                next_suffix[base] = n
+    return next_suffix
+
+
+def _next_unique_with_cache(base, sfmt_bound, used_names, next_suffix_dict):
     """
     Fast helper: find the next available name for 'base' using only
     Python data structures (no Rhino queries).
@@ -108,12 +297,13 @@ def _next_unique_with_cache(base, suffix_fmt, used_names, next_suffix_dict):
     ----------
     base : str
         Base name to modify.
-    suffix_fmt : str
-        Format string like " {num:03d}".
+    sfmt_bound : callable
+        Maps a suffix number to its suffix string (see `_suffix_formatter`).
     used_names : set
         Set of all names already known to be in use.
     next_suffix_dict : dict
-        Mapping base -> next suffix number to try.
+        Mapping base -> next suffix number to try (see `_seed_next_suffix`).
+        If that number is taken, later numbers are probed linearly.
 
     Returns
     -------
@@ -121,30 +311,43 @@ def _next_unique_with_cache(base, suffix_fmt, used_names, next_suffix_dict):
         A name that is not in used_names (and is reserved in used_names).
     """
     base = base or "Object"
+    contains = used_names.__contains__
     # Start from recorded suffix, or 1 if not present
     n = next_suffix_dict.get(base, 1)
 
     while True:
-        candidate = "{}{}".format(base, suffix_fmt.format(num=n))
-        if candidate not in used_names:
+        candidate = base + sfmt_bound(n)
+        if not contains(candidate):
             next_suffix_dict[base] = n + 1
             used_names.add(candidate)
             return candidate
         n += 1
 
 
+def _write_lines(lines):
+    """
+    Write buffered report lines to stdout in a single call.
+    """
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
 def rename_objects_unique(selected_only=False,
                           include_unnamed=True,
                           include_hidden=True,
                           dry_run=False,
                           suffix_fmt=" {num:03d}",
-                          verbose=True):
+                          verbose=True,
+                          full_doc_scan=True,
+                          base_filter=None):
     """
     Rename all Rhino objects so that each named object has a unique name.
     Reports statistics before renaming.
 
     This optimized implementation avoids repeated document lookups inside the
     renaming loop by:
+        - Working on RhinoObject references rather than GUIDs, so names are
+          read from and written to the object attributes directly
         - Caching the current names for all working objects
         - Building a document-wide set of used names once
         - Using purely Python set membership for name availability checks
@@ -161,6 +364,21 @@ def rename_objects_unique(selected_only=False,
         If True, only report renaming actions (no changes applied).
     suffix_fmt : str, optional
         Formatting for numeric suffix, e.g. " {num:03d}" or "-{num:03d}".
+    verbose : bool, optional
+        If True, print duplicate name frequencies and, on small datasets,
+        per-object rename details.
+    full_doc_scan : bool, optional
+        If True (default), collect the names of every object in the document
+        (all spaces, including layout objects) before renaming, so new names
+        never collide with objects outside the working set. The working set
+        never contains layout/page-space objects, lights or grips, so it
+        cannot stand in for this scan. Pass False to skip the scan and check
+        only against working-set names, when the caller knows no other
+        object can hold a conflicting name.
+    base_filter : str or compiled regex, optional
+        If given, only objects whose name matches this pattern (re.search)
+        are counted and renamed; all other objects are left untouched.
+        Unnamed objects are matched as "Object".
 
     Returns
     -------
@@ -171,158 +389,197 @@ def rename_objects_unique(selected_only=False,
     """
 
     # ------------------------------------------------------------
-    # Collect object IDs (always work with GUIDs)
+    # Collect Rhino objects (names are read from their attributes)
     # ------------------------------------------------------------
     if selected_only:
-        ids = rs.SelectedObjects()
+        objs = get_selected_objects()
     else:
-        # get_model_space_objects returns Rhino objects; convert to GUIDs
         objs = get_model_space_objects(include_hidden=True,
                                        include_locked=True,
                                        include_grips=False,
                                        include_lights=False)
-        ids = [obj.Id for obj in objs]
 
-    if not ids:
+    if not objs:
         print("No objects found.")
         return 0, {}
 
-    # Optional filtering: unnamed
-    if not include_unnamed:
-        ids = [obj_id for obj_id in ids
-               if (rs.ObjectName(obj_id) or "").strip()]
-
-    # Optional filtering: hidden / locked
-    if not include_hidden:
-        ids = [obj_id for obj_id in ids
-               if not rs.IsHidden(obj_id) and not rs.IsObjectLocked(obj_id)]
-
-    if not ids:
-        print("No named objects found.")
-        return 0, {}
-
     # ------------------------------------------------------------
-    # Cache names for working set and count frequencies
+    # Filter, cache names for working set and count frequencies
+    # (single pass over the objects)
     # ------------------------------------------------------------
-    name_counts = {}
-    name_by_id = {}
+    pairs = []
+    unnamed = 0
+    base_match = re.compile(base_filter).search if base_filter is not None else None
 
-    for obj_id in ids:
-        nm = rs.ObjectName(obj_id) or "Object"
-        name_by_id[obj_id] = nm
-        name_counts[nm] = name_counts.get(nm, 0) + 1
+    for obj in objs:
+        raw_name = obj.Attributes.Name
 
-    # Detect duplicates (base names with count > 1)
-    dup_names = dict((n, c) for (n, c) in name_counts.items() if c > 1)
+        # Optional filtering: unnamed
+        if not include_unnamed and not (raw_name or "").strip():
+            continue
 
-    # ------------------------------------------------------------
-    # Print statistics
-    # ------------------------------------------------------------
-    print("----- Object Name Statistics -----")
-    print("Total named objects:", len(ids))
-    print("Distinct names:", len(name_counts))
-    print("Duplicate name groups:", len(dup_names))
-    print("Total duplicate instances:", sum(dup_names.values()))
-    print("")
-
-    if dup_names:
-        print("Duplicate name frequencies:")
-        for nm, c in sorted(dup_names.items()):
-            print("  Name:", nm, " Count:", c)
-        print("")
-    else:
-        print("No duplicates detected.")
-        print("")
+        # Optional filtering: hidden / locked
+        if not include_hidden and (obj.IsHidden or obj.IsLocked):
+            continue
 
-    # If no duplicates, nothing to rename
-    if not dup_names:
-        print("All object names are already unique.")
-        return 0, name_counts
+        nm = raw_name or "Object"
 
-    # ------------------------------------------------------------
-    # Prepare for renaming (optimized path)
-    # ------------------------------------------------------------
-    # Build a global set of all names currently in use anywhere in the doc
-    used_names = _build_used_name_set()
-
-    # Ensure working set names are in used_names
-    # (in case include_unnamed filtered anything weird)
-    for nm in name_counts:
-        if nm:
-            used_names.add(nm)
-
-    renamed = 0
-    would_rename = 0
-    assigned_base_once = set()
-    next_suffix = {}
+        # Optional filtering: only names matching base_filter
+        if base_match is not None and not base_match(nm):
+            continue
 
-    # Deterministic ordering: (current name, GUID string)
-    ids_sorted = sorted(ids, key=lambda i: (name_by_id[i], str(i)))
+        pairs.append((obj, nm))
+        if not raw_name:
+            unnamed += 1
 
-    # Determine whether to print detailed output
-    large_dataset = len(ids) > 500
-    detailed = verbose and not large_dataset
+    if not pairs:
+        print("No named objects found.")
+        return 0, {}
 
-    if large_dataset and verbose:
-        print("Large dataset detected ({} objects). Suppressing detailed "
-              "per-object printing for performance.\n".format(len(ids)))
+    name_counts = Counter(nm for _, nm in pairs)
 
-    print("----- Renaming Duplicates -----")
+    # Detect duplicates (base names with count > 1)
+    dup_names = {n: c for (n, c) in name_counts.items() if c > 1}
 
-    renamed = 0
-    would_rename = 0
-    assigned_base_once = set()
-    next_suffix = {}
+    # ------------------------------------------------------------
+    # Print statistics
+    # ------------------------------------------------------------
+    # All report lines are collected and written to stdout in one call
+    lines = []
+    log = lines.append
 
-    rs.EnableRedraw(False)
+    # Written in a finally block so a partial report still appears if
+    # renaming fails part-way
     try:
-        for obj_id in ids_sorted:
-            base = name_by_id[obj_id]
-
-            if base not in dup_names:
-                continue
-
-            # Determine new name
-            if base not in assigned_base_once:
-                if base not in used_names:
-                    new_name = base
-                    used_names.add(new_name)
-                else:
-                    new_name = _next_unique_with_cache(base, suffix_fmt,
-                                                       used_names, next_suffix)
-                assigned_base_once.add(base)
-            else:
-                new_name = _next_unique_with_cache(base, suffix_fmt,
+        log("----- Object Name Statistics -----")
+        log("Total named objects: {}".format(len(pairs)))
+        log("Distinct names: {}".format(len(name_counts)))
+        log("Duplicate name groups: {}".format(len(dup_names)))
+        log("Total duplicate instances: {}".format(sum(dup_names.values())))
+        log("")
+
+        if dup_names:
+            if verbose:
+                log("Duplicate name frequencies:")
+                for nm, c in sorted(dup_names.items()):
+                    log("  Name: {}  Count: {}".format(nm, c))
+                log("")
+        else:
+            log("No duplicates detected.")
+            log("")
+
+        # If no duplicates, nothing to rename
+        if not dup_names:
+            log("All object names are already unique.")
+            return 0, name_counts
+
+        # ------------------------------------------------------------
+        # Prepare for renaming (optimized path)
+        # Nothing below runs for an already-clean working set.
+        # ------------------------------------------------------------
+        if full_doc_scan:
+            # Count all names currently in use anywhere in the doc
+            doc_counts = _count_used_names()
+            used_names = set(doc_counts)
+
+            # Ensure working set names are in used_names
+            # (in case include_unnamed filtered anything weird). Working-set
+            # names are never empty; unnamed objects count as "Object".
+            used_names |= set(name_counts)
+        else:
+            doc_counts = None
+            used_names = set(name_counts)
+
+        # A group's first object keeps its base name only if no object
+        # outside the working set uses it; otherwise every object in the
+        # group gets a suffix
+        if doc_counts is None:
+            keep_base = set(dup_names)
+        else:
+            keep_base = set()
+            for base, count in dup_names.items():
+                # Unnamed working-set objects are grouped as "Object" but do
+                # not appear in the document name counts
+                named_in_set = count - unnamed if base == "Object" else count
+                if doc_counts.get(base, 0) <= named_in_set:
+                    keep_base.add(base)
+
+        # Deterministic ordering: (current name, unnamed, GUID string), so
+        # within a group objects actually carrying the name come before
+        # unnamed ones grouped as "Object". Only objects in duplicate groups
+        # are renamed, so only those are sorted. Keys are built once per
+        # object and carry the object itself, so no id -> object or
+        # id -> name lookups are needed while renaming.
+        keyed = [(nm, not obj.Attributes.Name, obj.Id.ToString(), obj)
+                 for (obj, nm) in pairs if nm in dup_names]
+        keyed.sort(key=operator.itemgetter(0, 1, 2))
+
+        # Determine whether to print detailed output
+        large_dataset = len(pairs) > 500
+        detailed = verbose and not large_dataset
+
+        if large_dataset and verbose:
+            log("Large dataset detected ({} objects). Suppressing detailed "
+                "per-object printing for performance.\n".format(len(pairs)))
+
+        log("----- Renaming Duplicates -----")
+
+        renamed = 0
+        would_rename = 0
+        assigned_base_once = set()
+        # Start each duplicate group above its highest existing suffix
+        next_suffix = _seed_next_suffix(used_names, dup_names, suffix_fmt)
+        sfmt_bound = _suffix_formatter(suffix_fmt)
+
+        # Group all renames into a single undo step; no redraws while renaming
+        sc.doc.Views.RedrawEnabled = False
+        undo = None if dry_run else sc.doc.BeginUndoRecord("Rename unique")
+        try:
+            for base, no_name, _, obj in keyed:
+                # The first object of each group keeps its base name when no
+                # other object uses it, so it is never rewritten (nor is it
+                # on repeated runs of the tool). Unnamed objects do not carry
+                # the base, so they are always given a name
+                if base not in assigned_base_once:
+                    assigned_base_once.add(base)
+                    if base in keep_base and not no_name:
+                        continue
+
+                # Determine new name
+                new_name = _next_unique_with_cache(base, sfmt_bound,
                                                    used_names, next_suffix)
 
-            current = name_by_id[obj_id]
-
-            if current != new_name:
                 if dry_run:
                     if detailed:
-                        print("[DRY] {}: '{}' -> '{}'".format(obj_id, current, new_name))
+                        log("[DRY] {}: '{}' -> '{}'".format(obj.Id, base, new_name))
                     would_rename += 1
                 else:
-                    rs.ObjectName(obj_id, new_name)
+                    attr = obj.Attributes
+                    attr.Name = new_name
+                    sc.doc.Objects.ModifyAttributes(obj, attr, True)
                     if detailed:
-                        print("Renamed: '{}' -> '{}'".format(current, new_name))
+                        log("Renamed: '{}' -> '{}'".format(base, new_name))
                     renamed += 1
-    finally:
-        rs.EnableRedraw(True)
-
-    print("")
-
-    # Summary only
-    if dry_run:
-        print("Dry run complete. {} object(s) would have been renamed.".format(would_rename))
+        finally:
+            if undo is not None:
+                sc.doc.EndUndoRecord(undo)
+            sc.doc.Views.RedrawEnabled = True
+
+        log("")
+
+        # Summary only
+        if dry_run:
+            log("Dry run complete. {} object(s) would have been renamed.".format(would_rename))
+        else:
+            log("Done. Renamed {} object(s).".format(renamed))
         if not detailed:
-            print("(Use verbose=True for detailed printing on small datasets.)")
-        return 0, name_counts
-    else:
-        print("Done. Renamed {} object(s).".format(renamed))
-        if not detailed:
-            print("(Use verbose=True for detailed printing on small datasets.)")
+            log("(Use verbose=True for detailed printing on small datasets.)")
+
+        if dry_run:
+            return 0, name_counts
         return renamed, name_counts
+    finally:
+        _write_lines(lines)
 
 
 # Allow running directly inside Rhino
@@ -31,9 +31,11 @@ is warned and the requested operation is skipped.
 
 Module Reloading
 ----------------
-During each loop iteration the modules `rename_objects` and `view_object_names`
-are reloaded. This is useful during development, allowing changes to those
-modules to be picked up immediately without restarting Rhino.
+When the environment variable RHINO_TOOLKIT_DEV is set to "1", the modules
+`rename_objects` and `view_object_names` are reloaded during each loop
+iteration. This is useful during development, allowing changes to those
+modules to be picked up immediately without restarting Rhino. Otherwise the
+modules are imported once.
 
 Typical Usage
 -------------
@@ -47,15 +49,26 @@ Or assign to a toolbar button:
 
 """
 
+import os
+
 import rhinoscriptsyntax as rs
 import rename_objects
 import view_object_names
 
 # Optional: reload modules each time (useful during development)
-try:
-    reload
-except NameError:
-    from imp import reload
+DEV_MODE = os.environ.get("RHINO_TOOLKIT_DEV") == "1"
+
+if DEV_MODE:
+    try:
+        reload
+    except NameError:
+        from imp import reload
+
+# Menu options offered by rs.GetString, in display order
+_MENU_OPTIONS = ("SelectedObjects", "NameStats", "ListNames",
+                 "RenameDry", "RenameApply", "Exit")
+
+_PROMPT = "Choose action (Selected only: {0})".format
 
 
 def main():
@@ -63,7 +76,7 @@ def main():
     Launch the interactive toolbox menu.
 
     The function loops indefinitely until the user selects "Exit". Each loop:
-        - Reloads dependent modules (for development convenience)
+        - Reloads dependent modules when DEV_MODE is on
         - Displays the current selected-only status
         - Prompts the user for an action
         - Validates conditions (e.g., selected-only mode must have a selection)
@@ -74,17 +87,13 @@ def main():
 
     while True:
         # Make sure we see latest versions of the modules
-        reload(rename_objects)
-        reload(view_object_names)
+        if DEV_MODE:
+            reload(rename_objects)
+            reload(view_object_names)
 
         mode_label = "ON" if selected_only else "OFF"
-        prompt = "Choose action (Selected only: {0})".format(mode_label)
 
-        mode = rs.GetString(
-            prompt,
-            "ListNames",
-            ["SelectedObjects", "NameStats", "ListNames", "RenameDry", "RenameApply", "Exit"]
-        )
+        mode = rs.GetString(_PROMPT(mode_label), "ListNames", _MENU_OPTIONS)
 
         if not mode:
             print("Toolbox cancelled.")
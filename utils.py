@@ -13,15 +13,23 @@ Objects can be filtered based on:
     - Whether grips or lights should be included
     - RhinoCommon ActiveSpace (model vs. page/layout)
 
-By default, this module excludes lights, grips, and other non-geometry object
-types unless explicitly enabled. It returns full RhinoCommon object references
-(`RhinoObject`), not GUIDs, allowing callers to access attributes, names,
-geometry, and metadata directly.
+Visibility, lock and object-type filtering is delegated to RhinoCommon's
+`ObjectEnumeratorSettings`, so it runs in native code rather than per object
+in Python. By default, this module excludes lights, grips, and other
+non-geometry object types unless explicitly enabled. It returns full
+RhinoCommon object references (`RhinoObject`), not GUIDs, allowing callers to
+access attributes, names, geometry, and metadata directly.
+
+Repeated enumerations of an unchanged document can be served from a cache
+with `get_model_space_objects_cached`. Like the other toolkit caches, it is
+keyed by `doc_cache_key`: the active document plus a `doc_version` token that
+the caller changes whenever the document may have changed.
 
 Typical usage:
 --------------
-    from utils import get_model_space_objects
+    from utils import get_model_space_objects, get_selected_objects
     objs = get_model_space_objects(include_hidden=False)
+    sel = get_selected_objects()
 
 Used throughout:
 ----------------
@@ -31,21 +39,27 @@ Used throughout:
 """
 
 import Rhino
-from Rhino.DocObjects import ActiveSpace, ObjectType
+from Rhino.DocObjects import ActiveSpace
 import scriptcontext as sc
 
+# Cached object lists for the current doc_cache_key, keyed by filters
+_cache_doc_key = None
+_cache = {}
+
 
 def get_model_space_objects(include_hidden=True,
                             include_locked=True,
                             include_grips=False,
-                            include_lights=False):
+                            include_lights=False,
+                            model_space_only=True):
     """
     Return a filtered list of Rhino model-space objects.
 
-    This function iterates over all objects in the active Rhino document and
-    selects only those whose Attributes.Space is ActiveSpace.ModelSpace.
-    Additional optional filters allow the caller to include or exclude hidden
-    objects, locked objects, display grips, and lights.
+    This function enumerates the active Rhino document through an
+    ObjectEnumeratorSettings filter and keeps only those objects whose
+    Attributes.Space is ActiveSpace.ModelSpace. Additional optional filters
+    allow the caller to include or exclude hidden objects, locked objects,
+    display grips, and lights.
 
     Parameters
     ----------
@@ -59,31 +73,105 @@ def get_model_space_objects(include_hidden=True,
         If True, include grip objects. Default is False.
     include_lights : bool, optional
         If True, include light objects. Default is False.
+    model_space_only : bool, optional
+        If True (default), drop layout/page-space objects. If False, objects
+        from every space are returned.
     """
 
-    result = []
+    settings = Rhino.DocObjects.ObjectEnumeratorSettings()
+    settings.NormalObjects = True
+    settings.DeletedObjects = False
+    settings.IncludePhantoms = False
+
+    # Hidden / locked filtering
+    settings.HiddenObjects = include_hidden
+    settings.LockedObjects = include_locked
 
-    for obj in sc.doc.Objects:
-        attr = obj.Attributes
+    # Grips and lights
+    settings.IncludeGrips = include_grips
+    settings.IncludeLights = include_lights
 
-        # Only model space objects
-        if attr.Space != ActiveSpace.ModelSpace:
-            continue
+    objs = sc.doc.Objects.GetObjectList(settings)
 
-        # Skip hidden if requested
-        if not include_hidden and obj.IsHidden:
-            continue
+    if not model_space_only:
+        return list(objs)
 
-        # Skip locked if requested
-        if not include_locked and obj.IsLocked:
-            continue
+    # Only model space objects
+    model_space = ActiveSpace.ModelSpace
+    return [obj for obj in objs if obj.Attributes.Space == model_space]
 
-        # Skip grips, lights, and phantoms
-        if not include_grips and obj.ObjectType == ObjectType.Grip:
-            continue
-        if not include_lights and obj.ObjectType == ObjectType.Light:
-            continue
 
-        result.append(obj)
+def get_selected_objects(include_lights=False, include_grips=False):
+    """
+    Return the currently selected Rhino objects.
+
+    This mirrors rs.SelectedObjects() but returns `RhinoObject` references
+    instead of GUIDs, so callers can read attributes directly without
+    resolving each GUID back through the document.
+
+    Parameters
+    ----------
+    include_lights : bool, optional
+        If True, include selected light objects. Default is False.
+    include_grips : bool, optional
+        If True, include selected grip objects. Default is False.
+    """
+    objs = sc.doc.Objects.GetSelectedObjects(include_lights, include_grips)
+    return list(objs) if objs else []
+
+
+def doc_cache_key(doc_version):
+    """
+    Return the key under which toolkit caches store results for the active
+    document.
 
-    return result
\ No newline at end of file
+    Parameters
+    ----------
+    doc_version : hashable
+        Token identifying the state of the document. The caller must pass a
+        new value (e.g. a fresh object() per toolkit action, or a counter
+        bumped after each edit) whenever the document may have changed;
+        reusing a token returns cached results.
+    """
+    return (sc.doc.RuntimeSerialNumber, doc_version)
+
+
+def get_model_space_objects_cached(doc_version,
+                                   include_hidden=True,
+                                   include_locked=True,
+                                   include_grips=False,
+                                   include_lights=False,
+                                   model_space_only=True):
+    """
+    Memoized version of `get_model_space_objects`.
+
+    Results are cached per `doc_cache_key(doc_version)`, so back-to-back
+    calls with the same token skip the enumeration. Only the most recent
+    token is kept.
+
+    Parameters
+    ----------
+    doc_version : hashable
+        Document state token (see `doc_cache_key`).
+
+    The remaining parameters are the same as for `get_model_space_objects`.
+    A new list is returned on every call, so callers may modify it freely.
+    """
+    global _cache_doc_key
+
+    doc_key = doc_cache_key(doc_version)
+    if doc_key != _cache_doc_key:
+        _cache.clear()
+        _cache_doc_key = doc_key
+
+    key = (include_hidden, include_locked, include_grips, include_lights,
+           model_space_only)
+    objs = _cache.get(key)
+    if objs is None:
+        objs = _cache[key] = get_model_space_objects(
+            include_hidden=include_hidden,
+            include_locked=include_locked,
+            include_grips=include_grips,
+            include_lights=include_lights,
+            model_space_only=model_space_only)
+    return list(objs)
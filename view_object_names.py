@@ -1,7 +1,7 @@
 """
 Tools for inspecting and reporting object name information in a Rhino document.
 
-This module provides two main utilities:
+This module provides three main utilities:
 
     - get_object_name_stats(...)
         Computes frequency statistics for all object names in the model or a
@@ -11,18 +11,26 @@ This module provides two main utilities:
 
     - list_object_info(...)
         Prints a detailed listing of object names (and optionally descriptions)
-        in the document or the current selection. Also marks occurrences of
-        duplicate names for quick visual identification.
+        in the document or the current selection. Also marks every occurrence
+        of a duplicate name for quick visual identification.
 
-Both functions support flexible filtering options, including:
+    - iter_object_info(...)
+        Generator yielding the same per-object information without printing,
+        for callers that stream over large models.
+
+All three support flexible filtering options, including:
     - Operating only on selected objects
     - Including or excluding unnamed objects
     - Including or excluding hidden or locked objects
     - Optionally printing object descriptions (user text stored in Rhino)
 
-Model-space filtering is handled via `get_model_space_objects` in `utils.py`,
+Model-space filtering is handled via `get_model_space_objects` in `utils.py`
+(or its cached variant when a `doc_version` token is passed, so back-to-back
+reports on an unchanged document enumerate it once),
 ensuring that layout/page objects, lights, grips, and other non-geometry
-entities are not included unless explicitly requested.
+entities are not included unless explicitly requested. Names, visibility and
+descriptions are read directly from the returned `RhinoObject` references
+rather than through per-GUID rhinoscriptsyntax calls.
 
 Typical usage inside Rhino:
 ---------------------------
@@ -36,10 +44,69 @@ This module is focused purely on reporting, it does not modify object names.
 For renaming operations, see `rename_objects.py`.
 """
 
-import rhinoscriptsyntax as rs
-from utils import get_model_space_objects
+import sys
+from collections import Counter
+
+from utils import (get_model_space_objects, get_model_space_objects_cached,
+                   get_selected_objects)
+
+def _collect_objects(selected_only, include_unnamed, include_hidden, doc_version=None):
+    """
+    Collect the filtered working set and its names.
+
+    Shared by all reporting functions so selection, visibility and unnamed
+    filtering behave identically (and benefit from the same caching).
+
+    Returns
+    -------
+    objs : list of RhinoObject
+        Objects that passed the filters.
+    names : list of str
+        Object names, parallel to objs. Unnamed objects get "".
+    """
+    # Hidden / locked filtering is done by the model-space enumerator; only
+    # the selection still needs checking here
+    if selected_only:
+        objs = get_selected_objects()
+        if not include_hidden:
+            objs = [obj for obj in objs if not (obj.IsHidden or obj.IsLocked)]
+    elif doc_version is None:
+        objs = get_model_space_objects(include_hidden=include_hidden,
+                                       include_locked=include_hidden,
+                                       include_grips=False,
+                                       include_lights=False)
+    else:
+        objs = get_model_space_objects_cached(doc_version,
+                                              include_hidden=include_hidden,
+                                              include_locked=include_hidden,
+                                              include_grips=False,
+                                              include_lights=False)
+
+    # Read each name once; the filter and the callers share it. Rhino
+    # reports unnamed objects as None or "", so both become ""
+    named = [(obj, obj.Attributes.Name or "") for obj in objs]
+
+    # Only named
+    if not include_unnamed:
+        named = [(obj, nm) for (obj, nm) in named if nm.strip()]
+
+    return [obj for obj, _ in named], [nm for _, nm in named]
+
+
+def _counts_series(pd, name_counts):
+    """
+    Convert a name -> count mapping into a pandas Series sorted by count.
+
+    pandas is optional, so the caller imports it only when a Series is
+    requested and passes the module in as `pd`; the module keeps working in
+    Rhino's IronPython where it is not available.
+    """
+    counts = pd.Series(dict(name_counts), dtype="int64")
+    return counts.sort_values(ascending=False, kind="mergesort")
+
 
-def get_object_name_stats(selected_only=False, include_unnamed=True, include_hidden=True):
+def get_object_name_stats(selected_only=False, include_unnamed=True, include_hidden=True, as_frame=False,
+                          sort="name", doc_version=None):
     """
     Compute statistics for object names in the Rhino document.
 
@@ -51,69 +118,138 @@ def get_object_name_stats(selected_only=False, include_unnamed=True, include_hid
         Whether to include unnamed objects objects.
     include_hidden : bool
         Whether to include hidden or locked objects.
+    as_frame : bool
+        If True, return the counts as pandas Series (requires pandas; an
+        ImportError is raised before any report is printed if it is missing).
+    sort : str
+        Order of the printed duplicate listing: "name" (alphabetical,
+        default) or "count" (most frequent first).
+    doc_version : hashable, optional
+        If given, model-space objects are served from the cache for this
+        document state token (see `utils.doc_cache_key`); pass the same
+        token to consecutive reports on an unchanged document.
 
     Returns
     -------
     name_counts : dict
-        Mapping from object name to frequency.
+        Mapping from object name to frequency (unnamed objects are counted
+        under the empty string ""). With as_frame=True, a
+        pandas Series indexed by name and sorted by descending count, so
+        e.g. `name_counts.head(k)` gives the k most common names.
     duplicates : dict
-        Mapping of only those names that appear more than once.
+        Mapping of only those names that appear more than once (a Series
+        with as_frame=True).
     ids : list
         List of object IDs included in the analysis.
     """
 
-    # ids = rs.AllObjects(select=False, include_lights=False, include_grips=False)
-    if selected_only:
-        ids = rs.SelectedObjects()
-    else:
-        ids = get_model_space_objects(include_hidden=True,
-                                include_locked=True,
-                                include_grips=False,
-                                include_lights=False)
-    if not ids:
+    if sort not in ("name", "count"):
+        raise ValueError("sort must be 'name' or 'count', got {!r}".format(sort))
+
+    # Fail on a missing pandas before anything is collected or printed
+    if as_frame:
+        import pandas as pd
+
+    objs, names = _collect_objects(selected_only, include_unnamed, include_hidden,
+                                   doc_version)
+    if not objs:
         print("No objects found.")
+        if as_frame:
+            counts = _counts_series(pd, {})
+            return counts, counts, []
         return {}, {}, []
 
-    # Optionally filter out hidden or locked
-    if not include_hidden:
-        ids = [obj_id for obj_id in ids
-               if not rs.IsHidden(obj_id) and not rs.IsObjectLocked(obj_id)]
+    ids = [obj.Id for obj in objs]
 
-    # Keep only named objects
-    if not include_unnamed:
-        ids = [obj_id for obj_id in ids if (rs.ObjectName(obj_id) or "").strip()]
-
-    # Count frequencies
-    name_counts = {}
-    for obj_id in ids:
-        nm = rs.ObjectName(obj_id)
-        name_counts[nm] = name_counts.get(nm, 0) + 1
+    # Count frequencies. Unnamed objects all share the "" bucket, so they are
+    # tallied with a plain length difference instead of hashing each one
+    named = [nm for nm in names if nm]
+    name_counts = Counter(named)
+    unnamed = len(names) - len(named)
+    if unnamed:
+        name_counts[""] = unnamed
 
     # Duplicate dictionary
-    duplicates = dict((n, c) for (n, c) in name_counts.items() if c > 1)
+    duplicates = {n: c for (n, c) in name_counts.items() if c > 1}
+
+    # Every object not in a duplicate group has a name of its own, so the
+    # duplicate instances follow from the totals without another pass
+    total = len(ids)
+    distinct = len(name_counts)
+    dup_instances = total - (distinct - len(duplicates))
 
     # Print stats
     print("----- Object Name Statistics -----")
-    print("Total objects:", len(ids))
-    print("Distinct names:", len(name_counts))
+    print("Total objects:", total)
+    print("Distinct names:", distinct)
     print("Duplicate name groups:", len(duplicates))
-    print("Total duplicate instances:", sum(duplicates.values()))
+    print("Total duplicate instances:", dup_instances)
     print("")
 
     if duplicates:
         print("Duplicate name frequencies:")
-        for nm, c in sorted(duplicates.items()):
-            print("  Name:", nm, " Count:", c)
+        if sort == "count":
+            for nm, c in name_counts.most_common(len(duplicates)):
+                print("  Name:", nm, " Count:", c)
+        else:
+            for nm, c in sorted(duplicates.items()):
+                print("  Name:", nm, " Count:", c)
         print("")
     else:
         print("No duplicate names detected.")
         print("")
     print("Done.")
+
+    if as_frame:
+        counts = _counts_series(pd, name_counts)
+        return counts, counts[counts > 1], ids
     return name_counts, duplicates, ids
 
 
 
-def list_object_info(selected_only=False, include_unnamed=True, include_hidden=True, include_description=True):
+def iter_object_info(selected_only=False, include_unnamed=True, include_hidden=True, include_description=True,
+                     doc_version=None):
+    """
+    Yield object names and descriptions one object at a time, without printing.
+
+    Streaming counterpart of `list_object_info` for callers that process
+    objects one by one: no per-object results are kept, and descriptions are
+    only read as each object is consumed.
+
+    Parameters
+    ----------
+    selected_only : bool
+        Whether to only use selected objects.
+    include_unnamed : bool
+        Whether to include unnamed objects objects.
+    include_hidden : bool
+        Whether to include hidden or locked objects.
+    include_description : bool
+        Whether to read object descriptions.
+    doc_version : hashable, optional
+        If given, model-space objects are served from the cache for this
+        document state token (see `utils.doc_cache_key`); pass the same
+        token to consecutive reports on an unchanged document.
+
+    Yields
+    ------
+    info : dict
+        { "id": guid, "name": string, "description": string or None }
+    """
+    objs, names = _collect_objects(selected_only, include_unnamed, include_hidden,
+                                   doc_version)
+
+    if include_description:
+        for obj, name in zip(objs, names):
+            yield {"id": obj.Id, "name": name,
+                   "description": obj.ShortDescription(False)}
+    else:
+        for obj, name in zip(objs, names):
+            yield {"id": obj.Id, "name": name, "description": None}
+
+
+def list_object_info(selected_only=False, include_unnamed=True, include_hidden=True, include_description=True,
+                     columnar=False, doc_version=None):
     """
     List object names and descriptions without computing global stats.
 
@@ -127,73 +263,96 @@ def list_object_info(selected_only=False, include_unnamed=True, include_hidden=T
         Whether to include hidden or locked objects.
     include_description : bool
         Whether to print object descriptions.
+    columnar : bool
+        If True, return parallel lists instead of one dict per object.
+    doc_version : hashable, optional
+        If given, model-space objects are served from the cache for this
+        document state token (see `utils.doc_cache_key`); pass the same
+        token to consecutive reports on an unchanged document.
 
     Returns
     -------
     results : list of dict
         Each dict contains:
             { "id": guid, "name": string, "description": string or None }
+        If columnar is True, a single dict of equal-length lists instead:
+            { "ids": [...], "names": [...], "descriptions": [...] }
     """
 
-    # Collect objects
-    if selected_only:
-        ids = rs.SelectedObjects()
-    else:
-        ids = get_model_space_objects(include_hidden=True,
-                                include_locked=True,
-                                include_grips=False,
-                                include_lights=False)
-    if not ids:
+    objs, names = _collect_objects(selected_only, include_unnamed, include_hidden,
+                                   doc_version)
+    if not objs:
         print("No objects found.")
+        if columnar:
+            return {"ids": [], "names": [], "descriptions": []}
         return []
 
-    # Optional hidden filter
-    if not include_hidden:
-        ids = [obj_id for obj_id in ids
-               if not rs.IsHidden(obj_id) and not rs.IsObjectLocked(obj_id)]
+    # Output lines are collected and written to stdout in one call
+    buf = []
+    app = buf.append
 
-    # Only named
-    if not include_unnamed:
-        ids = [obj_id for obj_id in ids if (rs.ObjectName(obj_id) or "").strip()]
-    
-    print("----- Object List -----")
-    print("Listing", len(ids), "named objects")
-    print("")
+    app("----- Object List -----")
+    app("Listing {} named objects".format(len(objs)))
+    app("")
 
-    results = []
-    seen_names = set()
+    # Names shared by more than one object; every occurrence is marked,
+    # including the first one
+    dup_names = {n for (n, c) in Counter(names).items() if c > 1}
 
-    for obj_id in ids:
-        name = rs.ObjectName(obj_id)
+    ids = []
+    descs = []
 
-        if name in seen_names:
-            print("** DUPLICATE **")
-        seen_names.add(name)
-
-        print("Object Name:", name)
+    # Bound methods used in the loop, looked up once
+    add_id = ids.append
+    add_desc = descs.append
+    name_line = "Object Name: {}".format
+    desc_line = "Object Description: {}".format
 
+    # The description check is loop-invariant, so each case gets its own loop
+    try:
         if include_description:
-            desc = rs.ObjectDescription(obj_id)
-            print("Object Description:", desc)
+            for obj, name in zip(objs, names):
+                if name in dup_names:
+                    app("** DUPLICATE **")
+
+                desc = obj.ShortDescription(False)
+                app(name_line(name))
+                app(desc_line(desc))
+                app("")
+
+                add_id(obj.Id)
+                add_desc(desc)
         else:
-            desc = None
+            for obj, name in zip(objs, names):
+                if name in dup_names:
+                    app("** DUPLICATE **")
 
-        print("")
+                app(name_line(name))
+                app("")
 
-        results.append({
-            "id": obj_id,
-            "name": name,
-            "description": desc
-        })
+                add_id(obj.Id)
+            descs.extend([None] * len(ids))
+    finally:
+        app("Done.")
+        sys.stdout.write("\n".join(buf) + "\n")
 
-    print("Done.")
-    return results
+    if columnar:
+        return {"ids": ids, "names": names, "descriptions": descs}
+
+    # Row dicts are only built when the caller wants them
+    return [{"id": obj_id, "name": name, "description": desc}
+            for obj_id, name, desc in zip(ids, names, descs)]
 
 
 # Optional direct run
 if __name__ == "__main__":
+    # Both reports run on the same unchanged document, so they share one
+    # enumeration through a token fresh to this run
+    doc_version = object()
+
     # Compute stats
-    get_object_name_stats(include_hidden=True)
+    get_object_name_stats(include_hidden=True, doc_version=doc_version)
 
     # Then list objects
-    list_object_info(include_hidden=True, include_description=True)
\ No newline at end of file
+    list_object_info(include_hidden=True, include_description=True,
+                     doc_version=doc_version)
\ No newline at end of file